@@ -1,29 +1,31 @@
 """Example usage of the A*-based traffic simulator."""
 
-from typing import List
+from typing import Dict, List
 
 from town import Town, TrafficSimulator, Vehicle
 
 
+# Translates Town.signal_state codes into their ASCII letters
+_SIGNAL_LETTERS = bytes.maketrans(b"\x00\x01\x02", b"GYR")
+
+
 def render_town(town: Town, vehicles: List[Vehicle]) -> None:
     """Render an ASCII representation of the town with vehicles and signals."""
-    def color(x: int, y: int) -> str:
-        sig = town.nodes[(x, y)].signal
-        return {
-            "green": "G",
-            "yellow": "Y",
-            "red": "R",
-        }[sig]
-
-    grid = [[color(x, y) for x in range(town.width)] for y in range(town.height)]
+    # Intersection ids are x * height + y, so row y is every height-th byte
+    state, height = town.signal_state, town.height
+    rows = [state[y::height].translate(_SIGNAL_LETTERS).decode() for y in range(height)]
+
+    cells: Dict[int, List[str]] = {}
     for idx, vehicle in enumerate(vehicles, start=1):
         if vehicle.path:
             x, y = vehicle.path[vehicle.position_index]
             # Show vehicle index at its current position
-            grid[y][x] = str(idx)
+            row = cells.get(y)
+            if row is None:
+                row = cells[y] = list(rows[y])
+            row[x] = str(idx)
 
-    for row in grid:
-        print(" ".join(row))
+    print("\n".join(" ".join(cells.get(y, row)) for y, row in enumerate(rows)))
     print()
 
 
@@ -45,8 +47,7 @@ def main() -> None:
         ((3, 6), (6, 3)),
         ((0, 3), (6, 0)),
     ]
-    for s, g in starts_goals:
-        simulator.add_vehicle(Vehicle(start=s, goal=g))
+    simulator.bulk_add_vehicles([Vehicle(start=s, goal=g) for s, g in starts_goals])
 
     step = 0
     MAX_STEPS = 15
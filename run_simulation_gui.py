@@ -37,6 +37,13 @@ VEHICLE_COLORS = [
     "indigo",
     "turquoise",
 ]
+# Canvas fill for each traffic signal state
+_SIG_COLORS = {"green": "green", "yellow": "yellow", "red": "red"}
+
+
+def signal_tag(offset: int) -> str:
+    """Canvas tag shared by all signal lights with the same phase offset."""
+    return f"signal_offset_{offset}"
 
 
 class VisualTrafficSimulator(TrafficSimulator):
@@ -46,7 +53,18 @@ class VisualTrafficSimulator(TrafficSimulator):
         super().__init__(town)
         self.canvas = canvas
         self.vehicle_items: List[int] = []
+        # Grid cell each vehicle item is currently drawn at
+        self.vehicle_cells: List[tuple[int, int]] = []
+        # Vehicles parked at their goal never move again and are skipped
+        self._done: List[bool] = []
         self.signal_items = signal_items
+        # Signals sharing a phase offset always show the same colour, so
+        # each offset group is recoloured with one tagged itemconfig.
+        # Maps tag -> (a representative intersection, colour last drawn).
+        self._signal_groups: Dict[str, List] = {}
+        for pos in signal_items:
+            node = town.nodes[pos]
+            self._signal_groups.setdefault(signal_tag(node.signal_offset), [pos, node.signal])
 
     def add_vehicle(self, vehicle: Vehicle) -> None:
         super().add_vehicle(vehicle)
@@ -67,28 +85,57 @@ class VisualTrafficSimulator(TrafficSimulator):
             outline=""
         )
         self.vehicle_items.append(item)
+        self.vehicle_cells.append((x, y))
+        self._done.append(vehicle.position_index >= len(vehicle.path) - 1)
 
     def step(self) -> None:
         super().step()
-        for (x, y), item in self.signal_items.items():
-            sig = self.town.nodes[(x, y)].signal
-            color = {"green": "green", "yellow": "yellow", "red": "red"}[sig]
-            self.canvas.itemconfig(item, fill=color)
-        for vehicle, item in zip(self.vehicles, self.vehicle_items):
+        for tag, group in self._signal_groups.items():
+            sig = self.town.nodes[group[0]].signal
+            if sig != group[1]:
+                self.canvas.itemconfig(tag, fill=_SIG_COLORS[sig])
+                group[1] = sig
+        for i, (vehicle, item) in enumerate(zip(self.vehicles, self.vehicle_items)):
+            if self._done[i]:
+                continue
+            if vehicle.position_index >= len(vehicle.path) - 1:
+                self._done[i] = True
             x, y = vehicle.path[vehicle.position_index]
-            cx = x * CELL_SIZE + CELL_SIZE / 2
-            cy = y * CELL_SIZE + CELL_SIZE / 2
-            self.canvas.coords(
-                item,
-                cx - VEHICLE_RADIUS,
-                cy - VEHICLE_RADIUS,
-                cx + VEHICLE_RADIUS,
-                cy + VEHICLE_RADIUS,
-            )
+            old_x, old_y = self.vehicle_cells[i]
+            if (x, y) == (old_x, old_y):
+                continue  # waiting at a signal; nothing to redraw
+            # Shift by the cell delta and let Tk offset the oval's corners
+            self.canvas.move(item, (x - old_x) * CELL_SIZE, (y - old_y) * CELL_SIZE)
+            self.vehicle_cells[i] = (x, y)
 
 
-def draw_roads(canvas: tk.Canvas, town: Town) -> Dict[tuple[int, int], int]:
-    """Draw road rectangles and traffic signals."""
+def _hex_color(canvas: tk.Canvas, name: str) -> str:
+    """Resolve a Tk color name to the ``#rrggbb`` form PhotoImage expects."""
+    r, g, b = canvas.winfo_rgb(name)
+    return f"#{r >> 8:02x}{g >> 8:02x}{b >> 8:02x}"
+
+
+def render_scenery(canvas: tk.Canvas, town: Town) -> tk.PhotoImage:
+    """Rasterize roads, lane markings and intersections into one image.
+
+    The scenery never changes while the simulation runs, so it is drawn
+    once into a pixel buffer instead of as thousands of canvas items.
+    """
+    width = town.width * CELL_SIZE
+    height = town.height * CELL_SIZE
+    background = _hex_color(canvas, canvas.cget("background"))
+    gray = _hex_color(canvas, "gray")
+    white = _hex_color(canvas, "white")
+    black = _hex_color(canvas, "black")
+    pixels = [[background] * width for _ in range(height)]
+
+    def fill(x1: float, y1: float, x2: float, y2: float, color: str) -> None:
+        left, right = max(int(x1), 0), min(int(x2), width)
+        if right <= left:
+            return
+        span = [color] * (right - left)
+        for row in range(max(int(y1), 0), min(int(y2), height)):
+            pixels[row][left:right] = span
 
     def center(pt: tuple[int, int]) -> tuple[float, float]:
         x, y = pt
@@ -101,45 +148,61 @@ def draw_roads(canvas: tk.Canvas, town: Town) -> Dict[tuple[int, int], int]:
             if (nx, ny) < (x, y):
                 continue  # avoid drawing the same road twice
             ncx, ncy = center((nx, ny))
-            if x == nx or y == ny:
-                # horizontal or vertical road with lane markings
-                if x == nx:
-                    x1 = cx - ROAD_WIDTH / 2
-                    x2 = cx + ROAD_WIDTH / 2
-                    y1, y2 = sorted([cy, ncy])
-                    canvas.create_rectangle(x1, y1, x2, y2, fill="gray", outline="")
-                    canvas.create_line(cx, y1, cx, y2, fill="white", dash=(4, 4))
-                else:
-                    y1 = cy - ROAD_WIDTH / 2
-                    y2 = cy + ROAD_WIDTH / 2
-                    x1, x2 = sorted([cx, ncx])
-                    canvas.create_rectangle(x1, y1, x2, y2, fill="gray", outline="")
-                    canvas.create_line(x1, cy, x2, cy, fill="white", dash=(4, 4))
+            if x == nx:
+                # vertical road with a dashed lane marking
+                y1, y2 = sorted([cy, ncy])
+                fill(cx - ROAD_WIDTH / 2, y1, cx + ROAD_WIDTH / 2, y2, gray)
+                for dash in range(int(y1), int(y2), 8):
+                    fill(cx, dash, cx + 1, min(dash + 4, y2), white)
+            elif y == ny:
+                # horizontal road with a dashed lane marking
+                x1, x2 = sorted([cx, ncx])
+                fill(x1, cy - ROAD_WIDTH / 2, x2, cy + ROAD_WIDTH / 2, gray)
+                for dash in range(int(x1), int(x2), 8):
+                    fill(dash, cy, min(dash + 4, x2), cy + 1, white)
             else:
-                # diagonal road drawn as a simple thick line
-                canvas.create_line(
-                    cx,
-                    cy,
-                    ncx,
-                    ncy,
-                    fill="gray",
-                    width=ROAD_WIDTH,
-                )
+                # diagonal road stamped as squares along its center line
+                steps = max(int(((ncx - cx) ** 2 + (ncy - cy) ** 2) ** 0.5), 1)
+                half = ROAD_WIDTH / 2
+                for i in range(steps + 1):
+                    px = cx + (ncx - cx) * i / steps
+                    py = cy + (ncy - cy) * i / steps
+                    fill(px - half, py - half, px + half, py + half, gray)
 
-    signal_items: Dict[tuple[int, int], int] = {}
+    # black disc under each signal light
+    r = int(ROAD_WIDTH / 2)
     for (x, y) in town.nodes:
         cx, cy = center((x, y))
-        r = ROAD_WIDTH / 2
-        canvas.create_oval(cx - r, cy - r, cx + r, cy + r, fill="black")
-        sig = town.nodes[(x, y)].signal
-        color = {"green": "green", "yellow": "yellow", "red": "red"}[sig]
+        for dy in range(-r, r + 1):
+            half = int((r * r - dy * dy) ** 0.5)
+            fill(cx - half, cy + dy, cx + half + 1, cy + dy + 1, black)
+
+    image = tk.PhotoImage(width=width, height=height)
+    image.put(" ".join("{" + " ".join(row) + "}" for row in pixels))
+    return image
+
+
+def draw_roads(canvas: tk.Canvas, town: Town) -> Dict[tuple[int, int], int]:
+    """Draw the static scenery image and traffic signals."""
+    image = render_scenery(canvas, town)
+    canvas.create_image(0, 0, anchor="nw", image=image)
+    # Tk does not hold a Python reference; keep the image alive with the canvas
+    canvas.scenery_image = image  # type: ignore[attr-defined]
+
+    signal_items: Dict[tuple[int, int], int] = {}
+    r = ROAD_WIDTH / 2
+    for (x, y) in town.nodes:
+        cx = x * CELL_SIZE + CELL_SIZE / 2
+        cy = y * CELL_SIZE + CELL_SIZE / 2
+        node = town.nodes[(x, y)]
         signal_items[(x, y)] = canvas.create_oval(
             cx - r / 2,
             cy - r / 2,
             cx + r / 2,
             cy + r / 2,
-            fill=color,
+            fill=_SIG_COLORS[node.signal],
             outline="",
+            tags=(signal_tag(node.signal_offset),),
         )
     return signal_items
 
@@ -162,6 +225,7 @@ def main() -> None:
 
     simulator = VisualTrafficSimulator(town, canvas, signal_items)
     # Add 20 vehicles with random start and goal positions
+    vehicles = []
     for _ in range(20):
         start = (
             random.randint(0, town.width - 1),
@@ -176,7 +240,8 @@ def main() -> None:
                 random.randint(0, town.width - 1),
                 random.randint(0, town.height - 1),
             )
-        simulator.add_vehicle(Vehicle(start=start, goal=goal))
+        vehicles.append(Vehicle(start=start, goal=goal))
+    simulator.bulk_add_vehicles(vehicles)
 
     def loop() -> None:
         if not simulator.is_complete():
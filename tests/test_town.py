@@ -1,6 +1,11 @@
 import pytest
 
-from town import Town, TrafficSimulator, Vehicle
+import town as town_module
+from town import Node, Town, TrafficSimulator, Vehicle
+
+
+def path_cost(town, path):
+    return sum(town.nodes[a].neighbors[b] for a, b in zip(path, path[1:]))
 
 
 def test_a_star_simple_path():
@@ -26,3 +31,259 @@ def test_vehicle_waits_at_red_signal():
     sim.step()  # signal turns green
     assert v.position_index == 1
 
+
+def test_routes_reject_coordinates_outside_town():
+    for town in (Town(3, 3), Town(3, 3, random_roads=True)):
+        for search in (town.a_star, town.bidirectional_a_star, town.path_from_table):
+            assert search((0, 0), (0, 3)) is None
+            assert search((0, 0), (3, 0)) is None
+            with pytest.raises(KeyError):
+                search((-1, 0), (2, 2))
+            with pytest.raises(KeyError):
+                search((0.5, 0), (2, 2))
+            assert search((0, 0), (1.5, 2)) is None
+            with pytest.raises(KeyError):
+                search(("0", 0), (2, 2))
+
+
+def test_routes_accept_integral_coordinates():
+    plain, weighted = Town(3, 3), Town(3, 3)
+    weighted.set_road_weight((1, 0), (2, 0), 2.5)
+    for town in (plain, weighted):
+        for search in (town.a_star, town.bidirectional_a_star, town.path_from_table):
+            path = search((1.0, 0), (2, 2.0))
+            assert path == search((1, 0), (2, 2))
+            assert path[0] == (1, 0)
+            assert type(path[0][0]) is int
+
+
+def test_a_star_avoids_heavy_road():
+    town = Town(2, 2)
+    town.set_road_weight((0, 0), (1, 0), 10.0)
+    path = town.a_star((0, 0), (1, 0))
+    assert path == [(0, 0), (0, 1), (1, 1), (1, 0)]
+
+
+def test_bidirectional_a_star_matches_a_star_cost():
+    town = Town(6, 5)
+    town.set_road_weight((1, 0), (2, 0), 5.0)
+    town.set_road_weight((3, 2), (3, 3), 4.0)
+    town.set_road_weight((0, 4), (1, 4), 3.0)
+
+    for start, goal in [((0, 0), (5, 4)), ((5, 0), (0, 4)), ((2, 2), (2, 2))]:
+        forward = town.a_star(start, goal)
+        both = town.bidirectional_a_star(start, goal)
+        assert both[0] == start
+        assert both[-1] == goal
+        assert path_cost(town, both) == path_cost(town, forward)
+
+
+def test_add_vehicle_replans_after_weight_change():
+    town = Town(2, 2)
+    sim = TrafficSimulator(town)
+    first = Vehicle(start=(0, 0), goal=(1, 0))
+    sim.add_vehicle(first)
+    assert first.path == [(0, 0), (1, 0)]
+
+    town.set_road_weight((0, 0), (1, 0), 10.0)
+    second = Vehicle(start=(0, 0), goal=(1, 0))
+    sim.add_vehicle(second)
+    assert second.path == [(0, 0), (0, 1), (1, 1), (1, 0)]
+    assert first.path == [(0, 0), (1, 0)]
+
+
+def test_add_vehicle_leaves_small_grids_lazy():
+    town = Town(10, 10)
+    sim = TrafficSimulator(town)
+    sim.add_vehicle(Vehicle(start=(0, 0), goal=(9, 9)))
+    assert sim.vehicles[0].path == town.bidirectional_a_star((0, 0), (9, 9))
+    assert not town.nodes._built
+
+
+def test_path_from_table_matches_a_star_cost():
+    town = Town(5, 4)
+    town.set_road_weight((1, 1), (2, 1), 6.0)
+    town.set_road_weight((2, 2), (2, 3), 3.0)
+    assert town.has_route_table
+
+    for goal in [(4, 3), (2, 1), (0, 0)]:
+        path = town.path_from_table((0, 0), goal)
+        assert path[0] == (0, 0)
+        assert path[-1] == goal
+        assert path_cost(town, path) == path_cost(town, town.a_star((0, 0), goal))
+
+
+def test_a_star_with_fractional_weights():
+    town = Town(2, 2)
+    town.set_road_weight((0, 0), (1, 0), 3.5)
+    assert town.a_star((0, 0), (1, 0)) == [(0, 0), (0, 1), (1, 1), (1, 0)]
+    town.set_road_weight((0, 0), (1, 0), 2.5)
+    assert town.a_star((0, 0), (1, 0)) == [(0, 0), (1, 0)]
+
+
+def test_a_star_follows_switches_between_integer_and_fractional_weights():
+    town = Town(2, 2)
+    detour = [(0, 0), (0, 1), (1, 1), (1, 0)]
+    direct = [(0, 0), (1, 0)]
+    for weight, path in [(4.0, detour), (3.5, detour), (2.0, direct), (2.5, direct), (5.0, detour)]:
+        town.set_road_weight((0, 0), (1, 0), weight)
+        assert town.a_star((0, 0), (1, 0)) == path
+
+
+def test_a_star_with_large_integer_weights():
+    # Far above the bucket queue's weight cap, so the heap search takes over
+    town = Town(2, 1)
+    town.set_road_weight((0, 0), (1, 0), 1e9)
+    assert town.a_star((0, 0), (1, 0)) == [(0, 0), (1, 0)]
+    town = Town(2, 2)
+    town.set_road_weight((0, 0), (1, 0), 1e9)
+    assert town.a_star((0, 0), (1, 0)) == [(0, 0), (0, 1), (1, 1), (1, 0)]
+
+
+def test_a_star_waits_for_the_cheaper_route_to_the_goal():
+    detour = [(0, 0), (0, 1), (1, 1), (1, 0)]
+    # The first expansion pushes the goal over the heavy direct road; it
+    # must not be accepted until the cheaper detour has been explored.
+    for weight, expected in [(4.0, detour), (3.5, detour), (2.0, [(0, 0), (1, 0)])]:
+        town = Town(2, 2)
+        town.set_road_weight((0, 0), (1, 0), weight)
+        assert town.a_star((0, 0), (1, 0)) == expected
+        assert town.bidirectional_a_star((0, 0), (1, 0)) == expected
+
+    # Equal-cost routes: any of them is fine, but the length must be optimal
+    town = Town(5, 5)
+    for start, goal in [((0, 0), (4, 4)), ((4, 0), (0, 4)), ((2, 2), (2, 3))]:
+        path = town.a_star(start, goal)
+        assert path[0] == start and path[-1] == goal
+        assert len(path) - 1 == abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+
+
+def test_grid_a_star_does_not_flood_equal_cost_cells():
+    town = Town(100, 100)
+    path = town.a_star((0, 0), (99, 99))
+    assert len(path) == 199
+    # Newest-first ties walk one route instead of the whole bounding box
+    assert len(set(town._scratch[0].dirty)) < 2 * len(path)
+
+
+def test_bulk_add_vehicles_plans_in_worker_processes(monkeypatch):
+    monkeypatch.setattr(town_module, "_PARALLEL_PLAN_MIN_ROUTES", 1)
+    town = Town(20, 20)
+    assert not town.has_route_table
+    pairs = [((0, 0), (19, 19)), ((5, 3), (0, 12)), ((0, 0), (19, 19)), ((7, 7), (7, 7))]
+    sim = TrafficSimulator(town)
+    sim.bulk_add_vehicles([Vehicle(start=s, goal=g) for s, g in pairs], processes=2)
+
+    assert [(v.start, v.goal) for v in sim.vehicles] == pairs
+    # Workers on a plain grid need no nodes built
+    assert not town.nodes._built
+    for vehicle in sim.vehicles:
+        assert vehicle.path == town.bidirectional_a_star(vehicle.start, vehicle.goal)
+
+
+def test_plan_routes_matches_bidirectional_a_star():
+    town = Town(20, 20)
+    town.set_road_weight((3, 3), (3, 4), 7.5)
+    town.set_road_weight((10, 10), (11, 10), 4.0)
+    pairs = [((0, 0), (19, 19)), ((3, 3), (3, 4)), ((0, 0), (0, 20)), ((9, 9), (9, 9))]
+    routes = town.plan_routes(pairs, processes=2)
+    assert routes == [town.bidirectional_a_star(start, goal) for start, goal in pairs]
+    assert routes[2] is None
+    with pytest.raises(KeyError):
+        town.plan_routes([((-1, 0), (0, 0))], processes=1)
+
+
+def test_jit_a_star_matches_exact_routes():
+    pytest.importorskip("numba")
+
+    town = Town(6, 5)
+    town.set_road_weight((1, 0), (2, 0), 5.5)
+    town.set_road_weight((3, 2), (3, 3), 4.0)
+
+    # Repeated queries also check the reused score buffers are reset
+    for start, goal in [((0, 0), (5, 4)), ((5, 0), (0, 4)), ((2, 2), (2, 2))] * 2:
+        jit_path = town.a_star(start, goal)
+        assert jit_path[0] == start
+        assert jit_path[-1] == goal
+        assert all(type(x) is int and type(y) is int for x, y in jit_path)
+        assert path_cost(town, jit_path) == path_cost(town, town.path_from_table(start, goal))
+
+
+def test_node_signal_constructor_argument():
+    assert Node(0, 0).signal == "green"
+    assert Node(0, 0, signal="red").signal == "red"
+    node = Node(0, 0, {}, "yellow", 2)
+    assert node.signal == "yellow"
+    assert node.signal_offset == 2
+
+
+def test_signal_offset_is_read_only():
+    town = Town(3, 3, randomize_signals=True)
+    node = town.nodes[(1, 1)]
+    offset = node.signal_offset
+    with pytest.raises(AttributeError):
+        node.signal_offset = offset + 1
+    assert node.signal_offset == offset
+
+
+def test_node_and_vehicle_compare_by_value():
+    assert Node(1, 2, {(1, 3): 1.0}, "red", 1) == Node(1, 2, {(1, 3): 1.0}, "red", 1)
+    assert Node(1, 2) != Node(1, 2, signal="red")
+    assert Node(1, 2) != Node(1, 2, signal_offset=1)
+    assert Vehicle((0, 0), (1, 0), [(0, 0), (1, 0)]) == Vehicle((0, 0), (1, 0), [(0, 0), (1, 0)])
+    assert Vehicle((0, 0), (1, 0)) != Vehicle((0, 0), (1, 0), position_index=1)
+    assert Town(2, 2).nodes[(0, 0)] == Town(2, 2).nodes[(0, 0)]
+
+
+def test_node_neighbors_are_read_only():
+    for town in (Town(3, 3), Town(3, 3, random_roads=True)):
+        node = town.nodes[(1, 1)]
+        neighbor = next(iter(node.neighbors))
+        with pytest.raises(TypeError):
+            node.neighbors[neighbor] = 50.0
+        with pytest.raises(AttributeError):
+            node.neighbors = {}
+        town.set_road_weight((1, 1), neighbor, 50.0)
+        assert node.neighbors[neighbor] == 50.0
+        assert town.nodes[neighbor].neighbors[(1, 1)] == 50.0
+
+
+def test_grid_nodes_are_built_on_lookup():
+    town = Town(4, 3)
+    assert not town.nodes._built
+    assert len(town.nodes) == 12
+    assert town.a_star((0, 0), (3, 2))[-1] == (3, 2)
+    assert not town.nodes._built
+
+    node = town.nodes[(2, 1)]
+    assert list(town.nodes._built) == [(2, 1)]
+    assert town.nodes[(2, 1)] is node
+    assert dict(node.neighbors) == {(1, 1): 1.0, (3, 1): 1.0, (2, 0): 1.0, (2, 2): 1.0}
+
+    assert (3, 2) in town.nodes
+    for pos in [(4, 0), (0, 3), (-1, 0), (0, -1), (1.5, 0), (1,), "ab", None]:
+        assert pos not in town.nodes
+    with pytest.raises(KeyError):
+        town.nodes[(4, 0)]
+    # Keys equal to integer coordinates find the same node, like a dict
+    assert (2.0, 1) in town.nodes
+    assert town.nodes[(2.0, 1)] is node
+
+    town.set_road_weight((0, 0), (1, 0), 5.0)
+    assert len(town.nodes._built) == 12
+    assert town.nodes[(1, 0)].neighbors[(0, 0)] == 5.0
+
+
+def test_town_nodes_are_read_only_in_both_modes():
+    for town in (Town(2, 2), Town(2, 2, random_roads=True)):
+        with pytest.raises(TypeError):
+            town.nodes[(0, 0)] = Node(0, 0)
+        assert sorted(town.nodes) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+
+def test_grid_nodes_accept_numpy_coordinates():
+    numpy = pytest.importorskip("numpy")
+    town = Town(3, 3)
+    node = town.nodes[(numpy.int64(1), numpy.int64(1))]
+    assert node is town.nodes[(1, 1)]
+    assert (node.x, node.y) == (1, 1) and type(node.x) is int
@@ -10,21 +10,588 @@ Codex environments with no external dependencies.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import heapq
 from heapq import heappop, heappush
+import itertools
+import os
 import random
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:  # optional: JIT-compiles the weighted A* kernel when installed
+    import numba
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+# Towns up to this many intersections keep a table of shortest-path trees
+_ROUTE_TABLE_MAX_NODES = 256
+# Fewer unplanned routes than this are searched in-process, since starting
+# worker processes would cost more than the searches themselves
+_PARALLEL_PLAN_MIN_ROUTES = 64
+# Largest road weight for which A* uses the bucket queue instead of a heap
+_BUCKET_QUEUE_MAX_WEIGHT = 64
+
+
+# Signal colours by the byte code stored in Town.signal_state
+SIGNAL_COLORS = ("green", "yellow", "red")
+SIGNAL_CODES = {color: code for code, color in enumerate(SIGNAL_COLORS)}
 
 
-@dataclass
 class Node:
     """A node in the grid representing an intersection."""
 
-    x: int
-    y: int
-    neighbors: Dict[Tuple[int, int], float] = field(default_factory=dict)
-    signal: str = "green"
-    signal_offset: int = 0
+    __slots__ = ("x", "y", "_neighbors", "_signal_offset", "_signals", "_id")
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        neighbors: Optional[Dict[Tuple[int, int], float]] = None,
+        signal: str = "green",
+        signal_offset: int = 0,
+    ) -> None:
+        self.x = x
+        self.y = y
+        self._neighbors: Dict[Tuple[int, int], float] = {} if neighbors is None else neighbors
+        self._signal_offset = signal_offset
+        # The signal lives in a byte buffer shared with the owning town;
+        # a standalone node gets a private one-byte buffer.
+        self._signals = bytearray(1)
+        self._id = 0
+        self.signal = signal
+
+    def __repr__(self) -> str:
+        return (
+            f"Node(x={self.x!r}, y={self.y!r}, neighbors={self._neighbors!r}, "
+            f"signal={self.signal!r}, signal_offset={self.signal_offset!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.x, self.y, self._neighbors, self.signal, self.signal_offset) == (
+            other.x,
+            other.y,
+            other._neighbors,
+            other.signal,
+            other.signal_offset,
+        )
+
+    # Mutable and compared by value, so unhashable like the dataclass it was
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def neighbors(self) -> Mapping[Tuple[int, int], float]:
+        """Read-only view of the roads from this node and their weights.
+
+        The town mirrors the roads into its search arrays, so weights are
+        changed with ``Town.set_road_weight`` rather than edited here.
+        """
+        return MappingProxyType(self._neighbors)
+
+    @property
+    def signal_offset(self) -> int:
+        """Phase offset of this signal, fixed once the node is created.
+
+        The owning town precomputes its signal frames from the offsets, so
+        the offset is read-only rather than a write that would be ignored.
+        """
+        return self._signal_offset
+
+    @property
+    def signal(self) -> str:
+        return SIGNAL_COLORS[self._signals[self._id]]
+
+    @signal.setter
+    def signal(self, color: str) -> None:
+        self._signals[self._id] = SIGNAL_CODES[color]
+
+
+class _SearchScratch:
+    """Search buffers reused across queries on one town.
+
+    ``g_score`` and ``came_from`` are sized to the whole town once; each
+    search records the ids it touches in ``dirty`` so the next one only
+    has to reset those instead of reallocating.
+    """
+
+    def __init__(self, count: int) -> None:
+        self.g_score = array("d", [float("inf")]) * count
+        self.came_from = array("i", [-1]) * count
+        self.heap: List[tuple] = []
+        self.dirty: List[int] = []
+
+    def reset(self) -> None:
+        inf = float("inf")
+        g_score, came_from = self.g_score, self.came_from
+        for i in self.dirty:
+            g_score[i] = inf
+            came_from[i] = -1
+        self.dirty.clear()
+        self.heap.clear()
+
+
+def _a_star_csr(
+    offsets: Sequence[int],
+    nbr_idx: Sequence[int],
+    nbr_w: Sequence[float],
+    coords: Sequence[Tuple[int, int]],
+    start_id: int,
+    goal_id: int,
+    scratch: _SearchScratch,
+) -> Optional[array]:
+    """A* over flat CSR adjacency arrays.
+
+    Works purely on integer ids and plain sequences so it carries no
+    reference to a ``Town`` and every name in the hot loop is a local.
+    ``coords`` maps each id to its ``(x, y)`` for the heuristic.
+    Returns the scratch ``came_from`` array (``-1`` ends the chain) once
+    the goal is reached, or ``None`` if it is unreachable.
+
+    The goal is accepted as soon as it is pushed with a g-score no larger
+    than the f-score just popped: every other open entry has at least
+    that f-score, so no cheaper route to the goal can remain.
+    """
+    push, pop = heappush, heappop
+    scratch.reset()
+    g_score, came_from, dirty = scratch.g_score, scratch.came_from, scratch.dirty
+    gx, gy = coords[goal_id]
+    # Each node's heuristic is computed at most once per query
+    h_cache: Dict[int, float] = {}
+    # Breaks f-score ties toward the newest entry, so the search follows
+    # one route to the goal instead of flooding every equal-f cell
+    tie = itertools.count(0, -1)
+
+    # Heap entries carry (f, tie, g, node id); g lets stale entries be
+    # spotted without keeping a separate f-score map.
+    sx, sy = coords[start_id]
+    open_set = scratch.heap
+    open_set.append((abs(sx - gx) + abs(sy - gy), next(tie), 0.0, start_id))
+    g_score[start_id] = 0.0
+    dirty.append(start_id)
+
+    while open_set:
+        current_f, _, current_g, current = pop(open_set)
+        if current_g > g_score[current]:
+            continue  # stale entry superseded by a cheaper push
+        if current == goal_id:
+            return came_from
+
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = nbr_idx[k]
+            tentative_g_score = current_g + nbr_w[k]
+            if tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                dirty.append(neighbor)
+                if neighbor == goal_id and tentative_g_score <= current_f:
+                    return came_from
+                h = h_cache.get(neighbor)
+                if h is None:
+                    nx, ny = coords[neighbor]
+                    h = abs(nx - gx) + abs(ny - gy)
+                    h_cache[neighbor] = h
+                push(open_set, (tentative_g_score + h, next(tie), tentative_g_score, neighbor))
+
+    return None
+
+
+def _a_star_csr_numeric(
+    offsets: Sequence[int],
+    nbr_idx: Sequence[int],
+    nbr_w: Sequence[float],
+    height: int,
+    start_id: int,
+    goal_id: int,
+    g_score,
+    came_from,
+):
+    """Array-only variant of ``_a_star_csr`` for JIT compilation with numba.
+
+    ``g_score`` and ``came_from`` are numpy buffers reused across queries,
+    all ``inf`` and ``-1`` on entry; every entry the search touches is
+    restored before returning. The heap holds plain numeric tuples so
+    every value has a fixed machine type. Returns the ids along the
+    path, or an empty array if the goal is unreachable.
+    """
+    gx, gy = goal_id // height, goal_id % height
+    sx, sy = start_id // height, start_id % height
+    tie = 0
+    open_set = [(float(abs(sx - gx) + abs(sy - gy)), tie, 0.0, start_id)]
+    g_score[start_id] = 0.0
+    dirty = [start_id]
+    found = False
+
+    while len(open_set) > 0 and not found:
+        current_f, _, current_g, current = heapq.heappop(open_set)
+        if current_g > g_score[current]:
+            continue  # stale entry superseded by a cheaper push
+        if current == goal_id:
+            found = True
+            break
+
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = np.int64(nbr_idx[k])
+            tentative_g_score = current_g + nbr_w[k]
+            if tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                dirty.append(neighbor)
+                if neighbor == goal_id and tentative_g_score <= current_f:
+                    found = True
+                    break
+                nx, ny = neighbor // height, neighbor % height
+                tie -= 1
+                heapq.heappush(
+                    open_set,
+                    (tentative_g_score + abs(nx - gx) + abs(ny - gy), tie, tentative_g_score, neighbor),
+                )
+
+    length = 0
+    if found:
+        node = goal_id
+        while node >= 0:
+            length += 1
+            node = came_from[node]
+    path = np.empty(length, np.int64)
+    node = goal_id
+    for i in range(length - 1, -1, -1):
+        path[i] = node
+        node = came_from[node]
+    for i in dirty:
+        g_score[i] = np.inf
+        came_from[i] = -1
+    return path
+
+
+# The JIT-compiled kernel, or None when numba is not installed
+_a_star_csr_jit = numba.njit(cache=True)(_a_star_csr_numeric) if numba is not None else None
+
+
+def _is_small_integer_weight(weight: float) -> bool:
+    return weight.is_integer() and 0 <= weight <= _BUCKET_QUEUE_MAX_WEIGHT
+
+
+def _a_star_buckets_csr(
+    offsets: Sequence[int],
+    nbr_idx: Sequence[int],
+    nbr_w: Sequence[float],
+    coords: Sequence[Tuple[int, int]],
+    start_id: int,
+    goal_id: int,
+    scratch: _SearchScratch,
+) -> Optional[array]:
+    """A* for small integer road weights using a bucket queue.
+
+    With integer weights and the Manhattan heuristic every f-score is an
+    integer, so the open set can be one LIFO bucket per f-score, popping
+    the newest entry first like the heap kernels' tie-break. A push
+    lands at most the road weight plus the change in heuristic above the
+    f-score just popped, about twice the largest weight, so with weights
+    of at most ``_BUCKET_QUEUE_MAX_WEIGHT`` the open buckets span a short
+    range and insert and extract-min are effectively O(1). Same contract
+    and early goal acceptance as ``_a_star_csr``.
+    """
+    scratch.reset()
+    g_score, came_from, dirty = scratch.g_score, scratch.came_from, scratch.dirty
+    gx, gy = coords[goal_id]
+    h_cache: Dict[int, float] = {}
+
+    sx, sy = coords[start_id]
+    current_f = abs(sx - gx) + abs(sy - gy)
+    # f-score -> stack of (g, node id) entries
+    buckets: Dict[float, List[Tuple[float, int]]] = defaultdict(list)
+    buckets[current_f].append((0.0, start_id))
+    g_score[start_id] = 0.0
+    dirty.append(start_id)
+
+    while True:
+        bucket = buckets.get(current_f)
+        if not bucket:
+            buckets.pop(current_f, None)
+            if not buckets:
+                break
+            # Jump straight to the lowest open f-score; with small weights
+            # only a handful of buckets are ever open at once
+            current_f = min(buckets)
+            continue
+        current_g, current = bucket.pop()
+        if current_g > g_score[current]:
+            continue  # stale entry superseded by a cheaper push
+        if current == goal_id:
+            return came_from
+
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = nbr_idx[k]
+            tentative_g_score = current_g + nbr_w[k]
+            if tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                dirty.append(neighbor)
+                if neighbor == goal_id and tentative_g_score <= current_f:
+                    return came_from
+                h = h_cache.get(neighbor)
+                if h is None:
+                    nx, ny = coords[neighbor]
+                    h = abs(nx - gx) + abs(ny - gy)
+                    h_cache[neighbor] = h
+                f = tentative_g_score + h
+                buckets[f].append((tentative_g_score, neighbor))
+                if f < current_f:
+                    # Only possible when the heuristic overestimates (e.g.
+                    # diagonal roads); step the pointer back to stay exact
+                    current_f = f
+
+    return None
+
+
+def _a_star_grid(
+    width: int,
+    height: int,
+    start_id: int,
+    goal_id: int,
+    scratch: _SearchScratch,
+) -> Optional[array]:
+    """A* specialised for the regular grid with unit road costs.
+
+    Neighbours are the in-bounds cardinal cells, so their ids are
+    computed arithmetically instead of read from adjacency arrays and no
+    nodes need to exist. Contract, ties and early goal acceptance follow
+    ``_a_star_csr``.
+    """
+    push, pop = heappush, heappop
+    scratch.reset()
+    g_score, came_from, dirty, open_set = scratch.g_score, scratch.came_from, scratch.dirty, scratch.heap
+    sx, sy = divmod(start_id, height)
+    gx, gy = divmod(goal_id, height)
+    tie = itertools.count(0, -1)
+    open_set.append((abs(sx - gx) + abs(sy - gy), next(tie), 0.0, start_id))
+    g_score[start_id] = 0.0
+    dirty.append(start_id)
+
+    while open_set:
+        current_f, _, current_g, current = pop(open_set)
+        if current_g > g_score[current]:
+            continue  # stale entry superseded by a cheaper push
+        if current == goal_id:
+            return came_from
+
+        cx, cy = divmod(current, height)
+        next_g = current_g + 1.0
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nx, ny = cx + dx, cy + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                neighbor = nx * height + ny
+                if next_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = next_g
+                    dirty.append(neighbor)
+                    if neighbor == goal_id and next_g <= current_f:
+                        return came_from
+                    push(open_set, (next_g + abs(nx - gx) + abs(ny - gy), next(tie), next_g, neighbor))
+
+    return None
+
+
+def _bidirectional_a_star_csr(
+    offsets: Sequence[int],
+    nbr_idx: Sequence[int],
+    nbr_w: Sequence[float],
+    coords: Sequence[Tuple[int, int]],
+    start_id: int,
+    goal_id: int,
+    scratches: Tuple[_SearchScratch, _SearchScratch],
+) -> Optional[List[int]]:
+    """Bidirectional A* over flat CSR adjacency arrays.
+
+    Roads are two-way, so the backward search walks the same arrays
+    towards ``start_id``. Each round expands the side with the smaller
+    frontier. ``best`` tracks the cheapest start-goal connection seen so
+    far; once either frontier's lowest f-score reaches it no shorter
+    path can exist. Returns the path as a list of node ids.
+    """
+    if start_id == goal_id:
+        return [start_id]
+    push, pop = heappush, heappop
+    inf = float("inf")
+    sx, sy = coords[start_id]
+    gx, gy = coords[goal_id]
+
+    # Index 0 searches from the start towards the goal, index 1 the reverse
+    targets = ((gx, gy), (sx, sy))
+    for scratch, origin in zip(scratches, (start_id, goal_id)):
+        scratch.reset()
+        scratch.heap.append((abs(sx - gx) + abs(sy - gy), 0.0, origin))
+        scratch.g_score[origin] = 0.0
+        scratch.dirty.append(origin)
+    open_sets = (scratches[0].heap, scratches[1].heap)
+    best = inf
+    meet = -1
+
+    while open_sets[0] and open_sets[1]:
+        if max(open_sets[0][0][0], open_sets[1][0][0]) >= best:
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        scratch = scratches[side]
+        open_set, g_score, came_from, dirty = scratch.heap, scratch.g_score, scratch.came_from, scratch.dirty
+        other_g = scratches[1 - side].g_score
+        tx, ty = targets[side]
+
+        _, current_g, current = pop(open_set)
+        if current_g > g_score[current]:
+            continue  # stale entry superseded by a cheaper push
+
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = nbr_idx[k]
+            tentative_g_score = current_g + nbr_w[k]
+            if tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                dirty.append(neighbor)
+                nx, ny = coords[neighbor]
+                push(open_set, (tentative_g_score + abs(nx - tx) + abs(ny - ty), tentative_g_score, neighbor))
+                if tentative_g_score + other_g[neighbor] < best:
+                    best = tentative_g_score + other_g[neighbor]
+                    meet = neighbor
+
+    if meet < 0:
+        return None
+    # Splice start..meet from the forward tree onto meet..goal from the backward one
+    forward, backward = scratches[0].came_from, scratches[1].came_from
+    path = [meet]
+    node = forward[meet]
+    while node >= 0:
+        path.append(node)
+        node = forward[node]
+    path.reverse()
+    node = backward[meet]
+    while node >= 0:
+        path.append(node)
+        node = backward[node]
+    return path
+
+
+def _shortest_path_tree_csr(
+    offsets: Sequence[int],
+    nbr_idx: Sequence[int],
+    nbr_w: Sequence[float],
+    source_id: int,
+) -> array:
+    """Dijkstra from ``source_id`` over flat CSR adjacency arrays.
+
+    Returns the predecessor of every node on its shortest path from the
+    source, ``-1`` for the source itself and unreachable nodes.
+    """
+    push, pop = heappush, heappop
+    inf = float("inf")
+    count = len(offsets) - 1
+    pred = array("i", [-1]) * count
+    dist: Dict[int, float] = {source_id: 0.0}
+    open_set: List[Tuple[float, int]] = [(0.0, source_id)]
+    while open_set:
+        current_d, current = pop(open_set)
+        if current_d > dist[current]:
+            continue  # stale entry superseded by a cheaper push
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = nbr_idx[k]
+            d = current_d + nbr_w[k]
+            if d < dist.get(neighbor, inf):
+                dist[neighbor] = d
+                pred[neighbor] = current
+                push(open_set, (d, neighbor))
+    return pred
+
+
+def _grid_coord(pos: object, width: int, height: int) -> Optional[Tuple[int, int]]:
+    """Return ``pos`` as an in-bounds ``(x, y)`` of plain ints, or ``None``.
+
+    Any numbers equal to integers are accepted, such as ``1.0`` or numpy
+    integers, matching the coordinate dict lookups of earlier versions.
+    """
+    try:
+        x, y = pos  # type: ignore[misc]
+        ix, iy = int(x), int(y)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if ix != x or iy != y or not (0 <= ix < width and 0 <= iy < height):
+        return None
+    return ix, iy
+
+
+class _LazyNodes(Mapping):
+    """``Town.nodes`` for a regular grid, building each node on first lookup.
+
+    Iterating visits every coordinate and therefore builds every node.
+    """
+
+    def __init__(self, town: Town) -> None:
+        self._town = town
+        self._built: Dict[Tuple[int, int], Node] = {}
+
+    def __getitem__(self, pos: Tuple[int, int]) -> Node:
+        node = self._built.get(pos)
+        if node is None:
+            town = self._town
+            key = _grid_coord(pos, town.width, town.height)
+            if key is None:
+                raise KeyError(pos)
+            node = self._built.get(key)
+            if node is None:
+                node = self._built[key] = town._build_grid_node(key)
+        return node
+
+    def __contains__(self, pos: object) -> bool:
+        return _grid_coord(pos, self._town.width, self._town.height) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for x in range(self._town.width):
+            for y in range(self._town.height):
+                yield (x, y)
+
+    def __len__(self) -> int:
+        return self._town.width * self._town.height
+
+
+# Road graph of the town being planned, set once per worker process
+_worker_graph: Optional[tuple] = None
+
+
+def _init_plan_worker(
+    width: int,
+    height: int,
+    csr: Optional[Tuple[Sequence[int], Sequence[int], Sequence[float], Sequence[Tuple[int, int]]]],
+) -> None:
+    global _worker_graph
+    count = width * height
+    _worker_graph = (width, height, csr, (_SearchScratch(count), _SearchScratch(count)))
+
+
+def _plan_worker(ids: Optional[Tuple[int, int]]) -> Optional[List[int]]:
+    """Plan one (start id, goal id) route in a worker process.
+
+    Mirrors ``Town.bidirectional_a_star``: the plain unit grid runs the
+    grid kernel, anything else the bidirectional search over ``csr``.
+    """
+    if ids is None:
+        return None
+    width, height, csr, scratches = _worker_graph  # type: ignore[misc]
+    if csr is not None:
+        return _bidirectional_a_star_csr(*csr, ids[0], ids[1], scratches)
+    came_from = _a_star_grid(width, height, ids[0], ids[1], scratches[0])
+    if came_from is None:
+        return None
+    path = []
+    current = ids[1]
+    while current >= 0:
+        path.append(current)
+        current = came_from[current]
+    path.reverse()
+    return path
 
 
 class Town:
@@ -41,42 +608,101 @@ class Town:
     ) -> None:
         self.width = width
         self.height = height
-        self.nodes: Dict[Tuple[int, int], Node] = {}
-        self._create_grid() if not random_roads else self._create_random_roads()
+        self.random_roads = random_roads
+        count = width * height
         self.green_duration = signal_duration
         self.yellow_duration = yellow_duration
         self.red_duration = signal_duration
         self.randomize_signals = randomize_signals
+        # Read-only mapping of coordinates to intersections in both modes
+        self.nodes: Mapping[Tuple[int, int], Node]
+        self._create_grid() if not random_roads else self._create_random_roads()
         cycle = self.green_duration + self.yellow_duration + self.red_duration
+        # Signal offsets by node id, kept so lazily built nodes can pick
+        # theirs up
+        self._signal_offsets: List[int] = (
+            [random.randint(0, cycle - 1) for _ in range(count)] if randomize_signals else [0] * count
+        )
         # Start so first update puts signals in red phase
         self.signal_step = self.green_duration + self.yellow_duration - 1
-        for node in self.nodes.values():
-            if randomize_signals:
-                node.signal_offset = random.randint(0, cycle - 1)
-            phase = (self.signal_step + node.signal_offset) % cycle
-            node.signal = self._phase_to_color(phase)
+        # One byte per intersection id holding its SIGNAL_CODES value
+        self.signal_state = bytearray(count)
+        self._phase_codes = bytes(SIGNAL_CODES[self._phase_to_color(p)] for p in range(cycle))
+        self._build_signal_frames()
+        self.signal_state[:] = self._signal_frames[self.signal_step % cycle]
+        if random_roads:
+            for node in self.nodes.values():
+                self._bind_node(node)
+
+        # The flat adjacency arrays are built on first use, see _ensure_adjacency
+        self._adjacency_built = False
+        # Reused by every search on this town; one per direction
+        self._scratch = (_SearchScratch(count), _SearchScratch(count))
+        # numpy score buffers for the JIT kernel, allocated on its first use
+        self._jit_scratch: Optional[tuple] = None
+        # While false on a regular grid every road has unit cost
+        self._has_weight_overrides = False
+        # Bumped whenever a road weight changes so cached routes can be dropped
+        self.weights_version = 0
+        # Small towns answer routes from per-source shortest-path trees,
+        # filled on first use of each start and reset on weight changes
+        self._route_table: Optional[Dict[int, array]] = (
+            {} if count <= _ROUTE_TABLE_MAX_NODES else None
+        )
+
+    def _build_signal_frames(self) -> None:
+        """Precompute the whole town's signal bytes for every step of the cycle.
+
+        Signals are periodic, so ``update_signals`` only has to copy one
+        precomputed frame into ``signal_state``. Frames capture the node
+        offsets at construction time.
+        """
+        codes = self._phase_codes
+        cycle = len(codes)
+        offsets = self._signal_offsets
+        if cycle <= 256:
+            # Map each offset byte straight to its code with one C-level pass
+            offset_bytes = bytes(offsets)
+            self._signal_frames = [
+                offset_bytes.translate(bytes(codes[(step + o) % cycle] for o in range(256)))
+                for step in range(cycle)
+            ]
+        else:
+            self._signal_frames = [
+                bytes(codes[(step + offset) % cycle] for offset in offsets) for step in range(cycle)
+            ]
+
+    def _bind_node(self, node: Node) -> Node:
+        """Attach a node to the town's signal buffer and offsets."""
+        node._signals = self.signal_state
+        node._id = i = self._node_id((node.x, node.y))
+        node._signal_offset = self._signal_offsets[i]
+        return node
 
     def _create_grid(self) -> None:
-        for x in range(self.width):
-            for y in range(self.height):
-                self.nodes[(x, y)] = Node(x, y)
+        # Nodes and their unit cost roads are only built when first looked up
+        self.nodes = _LazyNodes(self)
 
+    def _build_grid_node(self, pos: Tuple[int, int]) -> Node:
+        x, y = pos
+        node = self._bind_node(Node(x, y))
         # Connect nodes with unit cost roads by default
-        for x in range(self.width):
-            for y in range(self.height):
-                node = self.nodes[(x, y)]
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.width and 0 <= ny < self.height:
-                        node.neighbors[(nx, ny)] = 1.0
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                node._neighbors[(nx, ny)] = 1.0
+        return node
 
     def _create_random_roads(self) -> None:
         """Create random road connections with varying lengths."""
+        nodes: Dict[Tuple[int, int], Node] = {}
         for x in range(self.width):
             for y in range(self.height):
-                self.nodes[(x, y)] = Node(x, y)
+                nodes[(x, y)] = Node(x, y)
+        # Read-only like the lazy grid mapping; roads change via set_road_weight
+        self.nodes = MappingProxyType(nodes)
 
-        coords = list(self.nodes.keys())
+        coords = list(nodes.keys())
         for a in coords:
             # each node connects to a few random other nodes
             choices = random.sample(coords, random.randint(2, 4))
@@ -84,14 +710,83 @@ class Town:
                 if a == b:
                     continue
                 dist = ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
-                self.nodes[a].neighbors[b] = dist
-                self.nodes[b].neighbors[a] = dist
+                nodes[a]._neighbors[b] = dist
+                nodes[b]._neighbors[a] = dist
+
+    def _node_id(self, pos: Tuple[int, int]) -> int:
+        """Dense integer id of an intersection used by the flat adjacency."""
+        return pos[0] * self.height + pos[1]
+
+    def _search_ids(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Validate route endpoints and return their ids.
+
+        A start that is not an intersection raises ``KeyError``; such a
+        goal can never be reached, so ``None`` is returned instead.
+        """
+        start_pos = _grid_coord(start, self.width, self.height)
+        if start_pos is None:
+            raise KeyError(start)
+        goal_pos = _grid_coord(goal, self.width, self.height)
+        if goal_pos is None:
+            return None
+        return self._node_id(start_pos), self._node_id(goal_pos)
+
+    def _ensure_adjacency(self) -> None:
+        if not self._adjacency_built:
+            self._build_adjacency()
+            self._adjacency_built = True
+
+    def _build_adjacency(self) -> None:
+        """Flatten ``Node.neighbors`` into compressed sparse row arrays.
+
+        The neighbours of node ``i`` are ``_nbr_idx[_offsets[i]:_offsets[i + 1]]``
+        with matching weights in ``_nbr_w``. Searches walk these arrays
+        instead of hashing coordinate tuples. On a lazy grid this builds
+        every node.
+        """
+        count = self.width * self.height
+        # id -> node and id -> coordinate key, so hot paths index lists
+        # instead of hashing coordinate tuples
+        nodes_by_id: List[Node] = [None] * count  # type: ignore[list-item]
+        self._coords: List[Tuple[int, int]] = [None] * count  # type: ignore[list-item]
+        for pos, node in self.nodes.items():
+            i = self._node_id(pos)
+            nodes_by_id[i] = node
+            self._coords[i] = pos
+        self._offsets = array("i", [0]) * (count + 1)
+        self._nbr_idx = array("i")
+        self._nbr_w = array("d")
+        # (from_id, to_id) -> slot, so weight updates can patch the arrays
+        self._edge_slot: Dict[Tuple[int, int], int] = {}
+        for i, node in enumerate(nodes_by_id):
+            for neighbor, weight in node._neighbors.items():
+                nb = self._node_id(neighbor)
+                self._edge_slot[(i, nb)] = len(self._nbr_idx)
+                self._nbr_idx.append(nb)
+                self._nbr_w.append(weight)
+            self._offsets[i + 1] = len(self._nbr_idx)
+        # Small integer weights let A* use a bucket queue instead of a heap
+        self._small_integer_weights = all(_is_small_integer_weight(w) for w in self._nbr_w)
 
     def set_road_weight(self, a: Tuple[int, int], b: Tuple[int, int], weight: float) -> None:
         """Set weight for the road between two intersections."""
         if b in self.nodes[a].neighbors:
-            self.nodes[a].neighbors[b] = weight
-            self.nodes[b].neighbors[a] = weight
+            self._ensure_adjacency()
+            self.nodes[a]._neighbors[b] = weight
+            self.nodes[b]._neighbors[a] = weight
+            a_id, b_id = self._node_id(a), self._node_id(b)
+            self._nbr_w[self._edge_slot[(a_id, b_id)]] = weight
+            self._nbr_w[self._edge_slot[(b_id, a_id)]] = weight
+            self.weights_version += 1
+            self._has_weight_overrides = True
+            if not _is_small_integer_weight(float(weight)):
+                self._small_integer_weights = False
+            elif not self._small_integer_weights:
+                self._small_integer_weights = all(
+                    _is_small_integer_weight(w) for w in self._nbr_w
+                )
+            if self._route_table is not None:
+                self._route_table.clear()
 
     def _phase_to_color(self, phase: int) -> str:
         if phase < self.green_duration:
@@ -103,10 +798,9 @@ class Town:
     def update_signals(self) -> None:
         """Update traffic signals using a green/yellow/red cycle."""
         self.signal_step += 1
-        cycle = self.green_duration + self.yellow_duration + self.red_duration
-        for node in self.nodes.values():
-            phase = (self.signal_step + node.signal_offset) % cycle
-            node.signal = self._phase_to_color(phase)
+        frames = self._signal_frames
+        # In-place slice copy keeps the buffer shared with every Node
+        self.signal_state[:] = frames[self.signal_step % len(frames)]
 
     def heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
         """Manhattan distance heuristic used for A* search."""
@@ -114,57 +808,188 @@ class Town:
 
     def a_star(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
         """Return shortest path from start to goal using A* algorithm."""
-        open_set: List[Tuple[float, Tuple[int, int]]] = []
-        heappush(open_set, (0, start))
-
-        came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
-        g_score = {node: float("inf") for node in self.nodes}
-        g_score[start] = 0
-        f_score = {node: float("inf") for node in self.nodes}
-        f_score[start] = self.heuristic(start, goal)
-
-        while open_set:
-            _, current = heappop(open_set)
-            if current == goal:
-                return self._reconstruct_path(came_from, current)
-
-            for neighbor, weight in self.nodes[current].neighbors.items():
-                tentative_g_score = g_score[current] + weight
-                if tentative_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_g_score + self.heuristic(neighbor, goal)
-                    if (f_score[neighbor], neighbor) not in open_set:
-                        heappush(open_set, (f_score[neighbor], neighbor))
+        ids = self._search_ids(start, goal)
+        if ids is None:
+            return None
+        if not self._has_weight_overrides and not self.random_roads:
+            return self._a_star_grid(*ids)
+        self._ensure_adjacency()
+        if not self._small_integer_weights and _a_star_csr_jit is not None:
+            return self._a_star_jit(*ids)
+        search = _a_star_buckets_csr if self._small_integer_weights else _a_star_csr
+        came_from = search(
+            self._offsets,
+            self._nbr_idx,
+            self._nbr_w,
+            self._coords,
+            ids[0],
+            ids[1],
+            self._scratch[0],
+        )
+        if came_from is None:
+            return None
+        return self._reconstruct_path(came_from, ids[1])
 
-        return None
+    def _a_star_jit(self, start_id: int, goal_id: int) -> Optional[List[Tuple[int, int]]]:
+        if self._jit_scratch is None:
+            count = self.width * self.height
+            self._jit_scratch = (np.full(count, np.inf), np.full(count, -1, np.int32))
+        path = _a_star_csr_jit(
+            self._offsets, self._nbr_idx, self._nbr_w, self.height, start_id, goal_id, *self._jit_scratch
+        )
+        if not len(path):
+            return None
+        height = self.height
+        return [divmod(i, height) for i in path.tolist()]
+
+    def _a_star_grid(self, start_id: int, goal_id: int) -> Optional[List[Tuple[int, int]]]:
+        came_from = _a_star_grid(self.width, self.height, start_id, goal_id, self._scratch[0])
+        if came_from is None:
+            return None
+        return self._reconstruct_path(came_from, goal_id)
+
+    def bidirectional_a_star(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Return shortest path from start to goal searching from both ends."""
+        ids = self._search_ids(start, goal)
+        if ids is None:
+            return None
+        if not self._has_weight_overrides and not self.random_roads:
+            # On the open unit grid the Manhattan heuristic is exact and
+            # ties favour the newest entry, so a forward search runs
+            # straight along one shortest path
+            return self._a_star_grid(*ids)
+        self._ensure_adjacency()
+        path = _bidirectional_a_star_csr(
+            self._offsets,
+            self._nbr_idx,
+            self._nbr_w,
+            self._coords,
+            ids[0],
+            ids[1],
+            self._scratch,
+        )
+        if path is None:
+            return None
+        coords = self._coords
+        return [coords[i] for i in path]
+
+    @property
+    def has_route_table(self) -> bool:
+        """Whether ``path_from_table`` is available for this town."""
+        return self._route_table is not None
+
+    def path_from_table(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Return shortest path from start to goal using the route table.
+
+        The first query from a given start runs one Dijkstra search and
+        stores its predecessor tree; later queries from that start only
+        walk the tree, so it pays off when many routes share a few starts.
+        Each tree needs the full road arrays, which builds every node of a
+        lazy grid. Only available when ``has_route_table`` is true.
+        """
+        if self._route_table is None:
+            raise ValueError("town is too large for a route table")
+        ids = self._search_ids(start, goal)
+        if ids is None:
+            return None
+        self._ensure_adjacency()
+        start_id, goal_id = ids
+        pred = self._route_table.get(start_id)
+        if pred is None:
+            pred = _shortest_path_tree_csr(self._offsets, self._nbr_idx, self._nbr_w, start_id)
+            self._route_table[start_id] = pred
+        if goal_id != start_id and pred[goal_id] < 0:
+            return None
+        coords = self._coords
+        path = [coords[goal_id]]
+        node = goal_id
+        while node != start_id:
+            node = pred[node]
+            path.append(coords[node])
+        path.reverse()
+        return path
+
+    def plan_routes(
+        self, pairs: Sequence[Tuple[Tuple[int, int], Tuple[int, int]]], processes: Optional[int] = None
+    ) -> List[Optional[List[Tuple[int, int]]]]:
+        """Return ``bidirectional_a_star`` routes for many (start, goal) pairs.
+
+        The searches run in a pool of ``processes`` worker processes
+        (default ``os.cpu_count()``). Each worker receives the road layout
+        once at start-up: only the grid size while every road has unit
+        cost, the flat road arrays otherwise.
+        """
+        ids = [self._search_ids(start, goal) for start, goal in pairs]
+        csr = None
+        if self._has_weight_overrides or self.random_roads:
+            self._ensure_adjacency()
+            csr = (self._offsets, self._nbr_idx, self._nbr_w, self._coords)
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_plan_worker,
+            initargs=(self.width, self.height, csr),
+        ) as pool:
+            routes = pool.map(_plan_worker, ids, chunksize=max(len(ids) // (4 * workers), 1))
+            height = self.height
+            return [[divmod(i, height) for i in route] if route is not None else None for route in routes]
 
-    def _reconstruct_path(
-        self, came_from: Dict[Tuple[int, int], Tuple[int, int]], current: Tuple[int, int]
-    ) -> List[Tuple[int, int]]:
-        path = [current]
-        while current in came_from:
+    def _reconstruct_path(self, came_from: Sequence[int], current: int) -> List[Tuple[int, int]]:
+        height = self.height
+        path = [divmod(current, height)]
+        current = came_from[current]
+        while current >= 0:
+            path.append(divmod(current, height))
             current = came_from[current]
-            path.append(current)
         path.reverse()
         return path
 
 
-@dataclass
 class Vehicle:
     """Represents a vehicle moving through the town."""
 
-    start: Tuple[int, int]
-    goal: Tuple[int, int]
-    path: List[Tuple[int, int]] = field(default_factory=list)
-    position_index: int = 0
+    __slots__ = ("start", "goal", "path", "position_index")
+
+    def __init__(
+        self,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        path: Optional[List[Tuple[int, int]]] = None,
+        position_index: int = 0,
+    ) -> None:
+        self.start = start
+        self.goal = goal
+        self.path: List[Tuple[int, int]] = [] if path is None else path
+        self.position_index = position_index
+
+    def __repr__(self) -> str:
+        return (
+            f"Vehicle(start={self.start!r}, goal={self.goal!r}, path={self.path!r}, "
+            f"position_index={self.position_index!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.start, self.goal, self.path, self.position_index) == (
+            other.start,
+            other.goal,
+            other.path,
+            other.position_index,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
 
     def move(self, town: Town) -> Optional[Tuple[int, int]]:
         """Move the vehicle along its path by one step respecting signals."""
         if self.position_index < len(self.path) - 1:
-            next_pos = self.path[self.position_index + 1]
-            if town.nodes[next_pos].signal in ("red", "yellow"):
-                return self.path[self.position_index]
+            x, y = self.path[self.position_index + 1]
+            if town.signal_state[x * town.height + y]:
+                return self.path[self.position_index]  # not green: wait
             self.position_index += 1
             return self.path[self.position_index]
         return None
@@ -176,16 +1001,59 @@ class TrafficSimulator:
     def __init__(self, town: Town) -> None:
         self.town = town
         self.vehicles: List[Vehicle] = []
+        # Vehicles that have not reached their goal yet, in insertion order
+        self._active: List[Vehicle] = []
+        # Planned routes by (start, goal), valid for one town.weights_version
+        self._path_cache: Dict[Tuple[Tuple[int, int], Tuple[int, int]], List[Tuple[int, int]]] = {}
+        self._cache_version = town.weights_version
+
+    def _sync_cache(self) -> None:
+        if self._cache_version != self.town.weights_version:
+            self._path_cache.clear()
+            self._cache_version = self.town.weights_version
+
+    def _plan(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        self._sync_cache()
+        key = (start, goal)
+        path = self._path_cache.get(key)
+        if path is None:
+            path = self.town.bidirectional_a_star(start, goal) or []
+            self._path_cache[key] = path
+        return path
 
     def add_vehicle(self, vehicle: Vehicle) -> None:
-        vehicle.path = self.town.a_star(vehicle.start, vehicle.goal) or []
+        # Each vehicle gets its own copy so cached routes are never mutated
+        vehicle.path = list(self._plan(vehicle.start, vehicle.goal))
         self.vehicles.append(vehicle)
+        if vehicle.position_index < len(vehicle.path) - 1:
+            self._active.append(vehicle)
+
+    def bulk_add_vehicles(self, vehicles: List[Vehicle], processes: Optional[int] = None) -> None:
+        """Plan routes for many vehicles at once, then add them in order.
+
+        Routes that are not cached yet are searched in worker processes
+        with ``Town.plan_routes``. Small batches are planned in-process.
+        """
+        self._sync_cache()
+        missing = list(
+            dict.fromkeys((v.start, v.goal) for v in vehicles if (v.start, v.goal) not in self._path_cache)
+        )
+        if len(missing) >= _PARALLEL_PLAN_MIN_ROUTES:
+            for key, path in zip(missing, self.town.plan_routes(missing, processes)):
+                self._path_cache[key] = path or []
+        for vehicle in vehicles:
+            self.add_vehicle(vehicle)
 
     def step(self) -> None:
         self.town.update_signals()
-        for vehicle in self.vehicles:
+        finished = False
+        for vehicle in self._active:
             vehicle.move(self.town)
+            if vehicle.position_index >= len(vehicle.path) - 1:
+                finished = True
+        if finished:
+            self._active = [v for v in self._active if v.position_index < len(v.path) - 1]
 
     def is_complete(self) -> bool:
-        return all(v.position_index >= len(v.path) - 1 for v in self.vehicles)
+        return not self._active
 